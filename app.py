@@ -1,37 +1,93 @@
 """
-WebtapuApp - Flask application for PDF processing
+WebtapuApp - Quart application for PDF processing
 Simple web interface for uploading and processing Turkish property documents
 """
+import asyncio
+import functools
+import multiprocessing
 import os
-import json
+import shutil
 import tempfile
 import threading
+import time
 import uuid
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
-from queue import Empty, Queue
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
-from flask import Flask, render_template, request, send_file, flash, redirect, url_for, jsonify, Response
+import orjson
+from quart import Quart, render_template, request, send_file, flash, redirect, url_for, jsonify, make_response
 from werkzeug.utils import secure_filename
 
-from pdf_processor import PDFProcessor, process_pdf_files
+from job_store import JobStore
+from pdf_processor import PDFProcessor, PdfSource, UploadedPdf, process_pdf_files
 
-# Initialize Flask app
-app = Flask(__name__)
+# Initialize Quart app
+app = Quart(__name__)
 app.secret_key = os.environ.get('SECRET_KEY', 'dev-secret-key')
 
 # Configuration
 UPLOAD_FOLDER = Path(tempfile.gettempdir()) / 'webtapu_uploads'
 ALLOWED_EXTENSIONS = {'pdf'}
+ALLOWED_SUFFIXES = tuple(f'.{extension}' for extension in ALLOWED_EXTENSIONS)
 MAX_CONTENT_LENGTH = 100 * 1024 * 1024  # 100MB max file size
+UPLOAD_BUFFER_SIZE = 1024 * 1024  # 1MB chunks when persisting uploads
+IN_MEMORY_UPLOAD_LIMIT = 32 * 1024 * 1024  # smaller requests skip the upload folder
 
 app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
 app.config['MAX_CONTENT_LENGTH'] = MAX_CONTENT_LENGTH
 
-# In-memory job registry for progress tracking
-jobs: Dict[str, Dict[str, Any]] = {}
-jobs_lock = threading.Lock()
+# Job registry for progress tracking, shared by all server and worker processes
+job_store = JobStore(UPLOAD_FOLDER / "jobs.sqlite3")
 SUPPORTED_OUTPUT_FORMATS = {"excel", "csv"}
+EVENT_POLL_INTERVAL = 0.25  # seconds between event log polls
+HEARTBEAT_INTERVAL = 15  # seconds of silence before an SSE keep-alive
+JOB_TTL = 60 * 60  # seconds a finished job and its output are kept
+STALE_JOB_TTL = 24 * 60 * 60  # seconds without an update before any job is dropped
+JOB_LEASE_INTERVAL = 60 * 60  # seconds between refreshes of a job that is still held
+JOB_EVICTION_INTERVAL = 5 * 60  # seconds between sweeps for expired jobs
+
+
+def create_process_pool() -> ProcessPoolExecutor:
+    """
+    Create the bounded worker pool for the CPU-heavy PDF pipeline.
+
+    Workers are spawned rather than forked since the server process runs an
+    event loop and helper threads.
+    """
+    return ProcessPoolExecutor(
+        max_workers=os.cpu_count(),
+        mp_context=multiprocessing.get_context("spawn"),
+    )
+
+
+process_pool = create_process_pool()
+process_pool_lock = threading.Lock()
+
+
+def get_process_pool() -> ProcessPoolExecutor:
+    """Return the current worker pool."""
+    with process_pool_lock:
+        return process_pool
+
+
+def replace_broken_process_pool(broken_pool: ProcessPoolExecutor) -> None:
+    """
+    Swap in a fresh worker pool after a worker crash broke broken_pool.
+
+    A broken pool rejects every new submit, so without this one segfault or OOM
+    kill would fail all later jobs. Only the first caller for a given pool
+    replaces it, the jobs it took down with it find the new pool already there.
+    """
+    global process_pool
+    with process_pool_lock:
+        if process_pool is not broken_pool:
+            return
+        app.logger.error("A PDF worker process crashed, restarting the worker pool")
+        process_pool = create_process_pool()
+    broken_pool.shutdown(wait=False, cancel_futures=True)
+
 
 # Ensure upload directory exists
 UPLOAD_FOLDER.mkdir(parents=True, exist_ok=True)
@@ -39,306 +95,464 @@ UPLOAD_FOLDER.mkdir(parents=True, exist_ok=True)
 
 def allowed_file(filename):
     """Check if file has allowed extension."""
-    return '.' in filename and \
-           filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
+    return filename.lower().endswith(ALLOWED_SUFFIXES)
+
+
+def save_upload(file, upload_dir: Path) -> Path:
+    """Copy an uploaded file to disk in large chunks to keep write syscalls low."""
+    file_path = upload_dir / secure_filename(file.filename)
+    with open(file_path, 'wb', buffering=UPLOAD_BUFFER_SIZE) as dst:
+        shutil.copyfileobj(file.stream, dst, length=UPLOAD_BUFFER_SIZE)
+    return file_path
+
+
+def load_upload(file) -> UploadedPdf:
+    """Read an uploaded file into memory so it never touches the upload folder."""
+    return UploadedPdf(file.stream.read(), secure_filename(file.filename))
+
+
+def store_uploads(files: list, upload_dir: Optional[Path]) -> list[PdfSource]:
+    """Keep uploads in memory, or copy them into upload_dir when one is given."""
+    if upload_dir is None:
+        return [load_upload(file) for file in files]
+    upload_dir.mkdir(parents=True, exist_ok=True)
+    return [save_upload(file, upload_dir) for file in files]
+
+
+def keep_uploads_in_memory() -> bool:
+    """Whether the current request is small enough to process without a disk copy."""
+    return request.content_length is not None and request.content_length < IN_MEMORY_UPLOAD_LIMIT
 
 
 def create_job(output_format: str, total_files: int) -> str:
-    """Create a new processing job and register it in memory."""
+    """Create a new processing job and register it in the job store."""
     job_id = uuid.uuid4().hex
-    event_queue: Queue = Queue()
-    with jobs_lock:
-        jobs[job_id] = {
-            "id": job_id,
-            "status": "queued",
-            "output_format": output_format,
-            "total": total_files,
-            "processed": 0,
-            "queue": event_queue,
-            "output_path": None,
-            "error": None,
-        }
+    job_store.create(
+        job_id,
+        status="queued",
+        output_format=output_format,
+        total=total_files,
+        processed=0,
+    )
     return job_id
 
 
 def emit_job_event(job_id: str, event: Dict[str, Any]) -> None:
-    """Push an event to the job queue and update metadata."""
-    with jobs_lock:
-        job = jobs.get(job_id)
-        if not job:
-            return
-        status = event.get("event")
-        if status == "progress":
-            job["status"] = "processing"
-            job["processed"] = event.get("current", job.get("processed", 0))
-        elif status == "complete":
-            job["status"] = "finalizing"
-        elif status == "error":
-            job["status"] = "error"
-            job["error"] = event.get("message")
-        elif status in {"output_ready", "finished"}:
-            job["status"] = "completed"
-        job["queue"].put(event)
+    """Publish an event to the job's event log and update metadata."""
+    status = event.get("event")
+    if status == "progress":
+        job_store.update(job_id, status="processing", processed=event.get("current", 0))
+    elif status == "complete":
+        job_store.update(job_id, status="finalizing")
+    elif status == "error":
+        job_store.update(job_id, status="error", error=event.get("message"))
+    elif status in {"output_ready", "finished"}:
+        job_store.update(job_id, status="completed")
+    job_store.publish(job_id, event)
 
 
 from typing import Any, Dict, Optional
 
 def get_job(job_id: str) -> Optional[Dict[str, Any]]:
     """Retrieve a job by ID."""
-    with jobs_lock:
-        return jobs.get(job_id)
-
-
-def process_job(job_id: str, pdf_paths: list[Path], output_format: str, clean_watermarks: bool) -> None:
-    """Background worker that processes PDF files and streams progress."""
+    return job_store.get(job_id)
+
+
+def evict_expired_jobs() -> None:
+    """
+    Drop jobs that finished more than JOB_TTL ago, or saw no update for STALE_JOB_TTL,
+    and delete their files.
+    """
+    now = time.time()
+    for job_id, output_path in job_store.purge_expired(now - JOB_TTL, now - STALE_JOB_TTL):
+        # Jobs cut short by a restart never got to drop their upload folder
+        shutil.rmtree(app.config['UPLOAD_FOLDER'] / job_id, ignore_errors=True)
+        if not output_path:
+            continue
+        try:
+            os.remove(output_path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            app.logger.error(f"Error deleting file {output_path}: {e}")
+
+
+async def evict_expired_jobs_periodically() -> None:
+    """Sweep expired jobs every JOB_EVICTION_INTERVAL seconds while serving."""
+    while True:
+        try:
+            await asyncio.to_thread(evict_expired_jobs)
+        except Exception as e:
+            app.logger.error(f"Job eviction failed: {e}")
+        await asyncio.sleep(JOB_EVICTION_INTERVAL)
+
+
+job_eviction_task: Optional[asyncio.Task] = None
+
+# Progress streams of this process, job ID -> each stream's queue and the seq of
+# the last event it received. One poller task feeds them all from the job store.
+event_subscribers: Dict[str, Dict[asyncio.Queue, int]] = {}
+event_poller_task: Optional[asyncio.Task] = None
+
+
+async def poll_job_events() -> None:
+    """Fan out new events of all followed jobs every EVENT_POLL_INTERVAL seconds."""
+    while True:
+        await asyncio.sleep(EVENT_POLL_INTERVAL)
+        if not event_subscribers:
+            continue
+        cursors = {job_id: min(queues.values()) for job_id, queues in event_subscribers.items()}
+        try:
+            events = await asyncio.to_thread(job_store.events_for_jobs, cursors)
+        except Exception as e:
+            app.logger.error(f"Polling job events failed: {e}")
+            continue
+        for job_id, seq, event_name, payload in events:
+            queues = event_subscribers.get(job_id, {})
+            for queue, last_seq in list(queues.items()):
+                if seq > last_seq:
+                    queue.put_nowait((event_name, payload))
+                    queues[queue] = seq
+
+
+def subscribe_job_events(job_id: str) -> asyncio.Queue:
+    """Follow a job's events from its first one on, starting the poller if needed."""
+    global event_poller_task
+    if event_poller_task is None or event_poller_task.done():
+        event_poller_task = asyncio.create_task(poll_job_events())
+    queue: asyncio.Queue = asyncio.Queue()
+    event_subscribers.setdefault(job_id, {})[queue] = 0
+    return queue
+
+
+def unsubscribe_job_events(job_id: str, queue: asyncio.Queue) -> None:
+    """Stop following a job's events."""
+    queues = event_subscribers.get(job_id, {})
+    queues.pop(queue, None)
+    if not queues:
+        event_subscribers.pop(job_id, None)
+
+
+@app.before_serving
+async def start_job_eviction():
+    """Start the expired job sweeper."""
+    global job_eviction_task
+    job_eviction_task = asyncio.create_task(evict_expired_jobs_periodically())
+
+
+@app.after_serving
+async def stop_job_eviction():
+    """Stop the expired job sweeper and the job event poller."""
+    if job_eviction_task is not None:
+        job_eviction_task.cancel()
+    if event_poller_task is not None:
+        event_poller_task.cancel()
+
+
+def process_job_subprocess(
+    job_id: str,
+    pdf_paths: list[PdfSource],
+    output_format: str,
+    clean_watermarks: bool,
+    upload_folder: str,
+) -> Dict[str, Any]:
+    """Worker process entry point, reports progress through the job store."""
     output_extension = "xlsx" if output_format == "excel" else "csv"
-    output_dir = app.config['UPLOAD_FOLDER'] / "processed"
+    output_dir = Path(upload_folder) / "processed"
     output_dir.mkdir(parents=True, exist_ok=True)
     output_path = output_dir / f"{job_id}.{output_extension}"
 
-    def progress_callback(event: Dict[str, Any]) -> None:
-        emit_job_event(job_id, event)
+    # process_pdf_files already caps per-file progress events. The job already has
+    # its own process_pool worker, it must not start a pool of its own.
+    return process_pdf_files(
+        pdf_paths,
+        output_format=output_format,
+        output_path=output_path,
+        clean_watermarks=clean_watermarks,
+        progress_callback=functools.partial(emit_job_event, job_id),
+        max_workers=1,
+    )
+
+
+async def process_job(
+    job_id: str,
+    pdf_paths: list[PdfSource],
+    output_format: str,
+    clean_watermarks: bool,
+    download_url: str,
+    download_name: str,
+    upload_dir: Optional[Path],
+) -> None:
+    """
+    Background task that hands PDF files to the worker pool and reports the outcome.
+
+    The download URL and file name are resolved by the request that queued the
+    job, background tasks run outside any request context.
+    """
+    loop = asyncio.get_running_loop()
+    pool = get_process_pool()
 
     try:
-        result = process_pdf_files(
+        future = loop.run_in_executor(
+            pool,
+            process_job_subprocess,
+            job_id,
             pdf_paths,
-            output_format=output_format,
-            output_path=output_path,
-            clean_watermarks=clean_watermarks,
-            progress_callback=progress_callback,
+            output_format,
+            clean_watermarks,
+            str(app.config['UPLOAD_FOLDER']),
         )
+        # Keep the job fresh while it waits for or runs on a worker, so the stale
+        # job sweep never evicts it or its upload folder from under the worker
+        while True:
+            done, _ = await asyncio.wait({future}, timeout=JOB_LEASE_INTERVAL)
+            if done:
+                break
+            await asyncio.to_thread(job_store.touch, job_id)
+        result = future.result()
 
         if result.get("success"):
-            with jobs_lock:
-                job = jobs.get(job_id)
-                if job is not None:
-                    job["output_path"] = str(result["output_path"])
-                    job["status"] = "completed"
-                    download_name = job.get("download_name")
-                else:
-                    download_name = None
-            with app.test_request_context():
-                emit_job_event(job_id, {
-                    "event": "finished",
-                    "message": result["message"],
-                    "download_url": url_for('download_output', job_id=job_id),
-                    "download_name": download_name,
-                })
+            await asyncio.to_thread(
+                job_store.update, job_id, output_path=str(result["output_path"]), status="completed"
+            )
+            await asyncio.to_thread(emit_job_event, job_id, {
+                "event": "finished",
+                "message": result["message"],
+                "download_url": download_url,
+                "download_name": download_name,
+            })
         else:
-            emit_job_event(job_id, {
+            await asyncio.to_thread(emit_job_event, job_id, {
                 "event": "error",
                 "message": result.get("message", "Processing failed")
             })
+    except BrokenProcessPool:
+        # A crashed worker fails the jobs it took down, later jobs get a fresh pool
+        replace_broken_process_pool(pool)
+        await asyncio.to_thread(emit_job_event, job_id, {
+            "event": "error",
+            "message": "A worker process crashed while processing the files"
+        })
     except Exception as exc:
-        emit_job_event(job_id, {
+        await asyncio.to_thread(emit_job_event, job_id, {
             "event": "error",
             "message": f"Unexpected error: {exc}"
         })
     finally:
-        # Clean up uploaded PDF files
-        for path in pdf_paths:
-            try:
-                os.remove(path)
-            except OSError as e:
-                app.logger.error(f"Error deleting file {path}: {e}")
+        # Drop the job's upload folder, in-memory uploads need no cleanup
+        if upload_dir is not None:
+            shutil.rmtree(upload_dir, ignore_errors=True)
 
 
 @app.route('/')
-def index():
+async def index():
     """Main page with file upload form."""
-    return render_template('index.html')
+    return await render_template('index.html')
 
 
 @app.route('/upload', methods=['POST'])
-def upload_files():
+async def upload_files():
     """Handle PDF file uploads and processing."""
-    if 'pdf_files' not in request.files:
-        flash('No files selected', 'error')
+    request_files = await request.files
+    if 'pdf_files' not in request_files:
+        await flash('No files selected', 'error')
         return redirect(request.url)
-    
-    files = request.files.getlist('pdf_files')
-    output_format = request.form.get('output_format', 'excel')
+
+    files = request_files.getlist('pdf_files')
+    output_format = (await request.form).get('output_format', 'excel')
     clean_watermarks = True  # Watermark removal is now mandatory
-    
+
     # Filter valid PDF files
-    pdf_files = []
-    for file in files:
-        if file and file.filename and allowed_file(file.filename):
-            filename = secure_filename(file.filename)
-            file_path = UPLOAD_FOLDER / filename
-            file.save(file_path)
-            pdf_files.append(file_path)
-    
-    if not pdf_files:
-        flash('No valid PDF files uploaded', 'error')
+    valid_files = [file for file in files if file and file.filename and allowed_file(file.filename)]
+
+    if not valid_files:
+        await flash('No valid PDF files uploaded', 'error')
         return redirect(url_for('index'))
-    
+
+    # Store uploads in one worker thread hop, on disk in a folder of their own
+    upload_dir = None if keep_uploads_in_memory() else UPLOAD_FOLDER / uuid.uuid4().hex
+    pdf_files = await asyncio.to_thread(store_uploads, valid_files, upload_dir)
+
     # Process PDF files
+    pool = get_process_pool()
     try:
-        result = process_pdf_files(
-            pdf_files, 
+        result = await asyncio.get_running_loop().run_in_executor(pool, functools.partial(
+            process_pdf_files,
+            pdf_files,
             output_format=output_format,
-            clean_watermarks=clean_watermarks
-        )
-        
+            clean_watermarks=clean_watermarks,
+            max_workers=1,
+        ))
+
         if result['success']:
             output_path = result['output_path']
-            
+
             # Generate download filename
             if len(pdf_files) == 1:
-                base_name = Path(pdf_files[0]).stem
+                base_name = Path(pdf_files[0].name).stem
             else:
                 base_name = f"processed_{len(pdf_files)}_files"
-            
+
             download_name = f"{base_name}.{output_format}"
-            
-            flash(f'Successfully processed {len(pdf_files)} PDF files', 'success')
-            return send_file(
+
+            await flash(f'Successfully processed {len(pdf_files)} PDF files', 'success')
+            return await send_file(
                 output_path,
                 as_attachment=True,
-                download_name=download_name,
+                attachment_filename=download_name,
                 mimetype=f'application/{output_format}'
             )
         else:
-            flash(f'Processing failed: {result["message"]}', 'error')
+            await flash(f'Processing failed: {result["message"]}', 'error')
             return redirect(url_for('index'))
-            
+
+    except BrokenProcessPool:
+        replace_broken_process_pool(pool)
+        await flash('Error during processing: a worker process crashed', 'error')
+        return redirect(url_for('index'))
     except Exception as e:
-        flash(f'Error during processing: {str(e)}', 'error')
+        await flash(f'Error during processing: {str(e)}', 'error')
         return redirect(url_for('index'))
     finally:
-        # Clean up uploaded PDF files
-        for file_path in pdf_files:
-            try:
-                os.remove(file_path)
-            except OSError as e:
-                app.logger.error(f"Error deleting file {file_path}: {e}")
+        # Drop the request's upload folder, in-memory uploads need no cleanup
+        if upload_dir is not None:
+            shutil.rmtree(upload_dir, ignore_errors=True)
 
 
 @app.route('/api/process', methods=['POST'])
-def api_process():
+async def api_process():
     """API endpoint to handle PDF uploads and trigger asynchronous processing."""
-    if 'pdf_files' not in request.files:
+    request_files = await request.files
+    if 'pdf_files' not in request_files:
         return jsonify({"success": False, "message": "No files selected"}), 400
 
-    files = request.files.getlist('pdf_files')
-    output_format = request.form.get('output_format', 'excel').lower()
+    files = request_files.getlist('pdf_files')
+    output_format = (await request.form).get('output_format', 'excel').lower()
 
     if output_format not in SUPPORTED_OUTPUT_FORMATS:
         return jsonify({"success": False, "message": f"Unsupported output format: {output_format}"}), 400
 
-    valid_files = []
-    for file in files:
-        if file and file.filename and allowed_file(file.filename):
-            valid_files.append(file)
+    valid_files = [file for file in files if file and file.filename and allowed_file(file.filename)]
 
     if not valid_files:
         return jsonify({"success": False, "message": "No valid PDF files uploaded"}), 400
 
-    job_id = create_job(output_format, len(valid_files))
-    job_upload_dir = app.config['UPLOAD_FOLDER'] / job_id
-    job_upload_dir.mkdir(parents=True, exist_ok=True)
+    job_id = await asyncio.to_thread(create_job, output_format, len(valid_files))
 
-    pdf_paths = []
-    for file in valid_files:
-        filename = secure_filename(file.filename)
-        file_path = job_upload_dir / filename
-        file.save(file_path)
-        pdf_paths.append(file_path)
+    # Small uploads travel to the worker process in memory, larger ones via the job folder
+    upload_dir = None if keep_uploads_in_memory() else app.config['UPLOAD_FOLDER'] / job_id
+    pdf_paths = await asyncio.to_thread(store_uploads, valid_files, upload_dir)
 
     if len(pdf_paths) == 1:
-        base_name = pdf_paths[0].stem
+        base_name = Path(pdf_paths[0].name).stem
     else:
         base_name = f"processed_{len(pdf_paths)}_files"
 
     extension = "xlsx" if output_format == "excel" else "csv"
     download_name = f"{base_name}.{extension}"
 
-    with jobs_lock:
-        job = jobs.get(job_id)
-        if job is not None:
-            job["files"] = [str(path) for path in pdf_paths]
-            job["download_name"] = download_name
+    await asyncio.to_thread(
+        job_store.update, job_id, files=[str(path) for path in pdf_paths], download_name=download_name
+    )
 
-    emit_job_event(job_id, {
+    await asyncio.to_thread(emit_job_event, job_id, {
         "event": "queued",
         "message": f"Job queued with {len(pdf_paths)} PDF file(s)"
     })
 
-    worker = threading.Thread(
-        target=process_job,
-        args=(job_id, pdf_paths, output_format, True),
-        daemon=True,
+    download_url = url_for('download_output', job_id=job_id)
+    app.add_background_task(
+        process_job, job_id, pdf_paths, output_format, True, download_url, download_name, upload_dir
     )
-    worker.start()
 
     return jsonify({"success": True, "job_id": job_id})
 
 
 @app.route('/api/progress/<job_id>')
-def api_progress(job_id):
+async def api_progress(job_id):
     """Stream Server-Sent Events for job progress."""
-    job = get_job(job_id)
+    job = await asyncio.to_thread(get_job, job_id)
     if job is None:
         return jsonify({"success": False, "message": "Job not found"}), 404
 
-    def event_stream():
-        queue: Queue = job["queue"]
-        # Send initial handshake event
-        yield f"event: connected\ndata: {json.dumps({'job_id': job_id})}\n\n"
-        while True:
-            try:
-                event = queue.get(timeout=15)
-            except Empty:
-                # Keep-alive comment to prevent timeouts
-                yield ": heartbeat\n\n"
-                continue
-
-            event_name = event.get("event", "message")
-            yield f"event: {event_name}\n"
-            yield f"data: {json.dumps(event)}\n\n"
-
-            if event_name in {"finished", "error"}:
-                break
-
-    response = Response(event_stream(), mimetype='text/event-stream')
-    response.headers["Cache-Control"] = "no-cache"
-    response.headers["X-Accel-Buffering"] = "no"
+    async def event_stream():
+        queue = subscribe_job_events(job_id)
+        try:
+            # Send initial handshake event
+            yield b"event: connected\ndata: %s\n\n" % orjson.dumps({'job_id': job_id})
+            while True:
+                try:
+                    events = [await asyncio.wait_for(queue.get(), timeout=HEARTBEAT_INTERVAL)]
+                except asyncio.TimeoutError:
+                    # The job may have been evicted without ever finishing
+                    if await asyncio.to_thread(get_job, job_id) is None:
+                        yield b"event: error\ndata: %s\n\n" % orjson.dumps(
+                            {"event": "error", "message": "Job not found"}
+                        )
+                        return
+                    # Keep-alive comment to prevent timeouts
+                    yield b": heartbeat\n\n"
+                    continue
+
+                # Coalesce everything published since the last poll into one write;
+                # payloads are stored as serialized JSON and streamed as-is
+                while not queue.empty():
+                    events.append(queue.get_nowait())
+                chunk = []
+                for event_name, payload in events:
+                    chunk.append(b"event: %s\ndata: %s\n\n" % (event_name.encode(), payload))
+                    if event_name in {"finished", "error"}:
+                        yield b"".join(chunk)
+                        return
+                yield b"".join(chunk)
+        finally:
+            unsubscribe_job_events(job_id, queue)
+
+    response = await make_response(event_stream(), {
+        "Content-Type": "text/event-stream",
+        "Cache-Control": "no-cache",
+        "X-Accel-Buffering": "no",
+    })
+    # Long-lived stream, do not apply RESPONSE_TIMEOUT
+    response.timeout = None
     return response
 
 
 @app.route('/api/download/<job_id>')
-def download_output(job_id):
+async def download_output(job_id):
     """Provide the processed output file for download."""
-    job = get_job(job_id)
+    job = await asyncio.to_thread(get_job, job_id)
     if job is None or not job.get("output_path"):
-        flash("Üzgünüz, bu iş için indirilebilir bir dosya bulunamadı.", "error")
+        await flash("Üzgünüz, bu iş için indirilebilir bir dosya bulunamadı.", "error")
         return redirect(url_for('index'))
 
     output_path = Path(job["output_path"])
     if not output_path.exists():
-        flash("Çıktı dosyası bulunamadı.", "error")
+        await flash("Çıktı dosyası bulunamadı.", "error")
         return redirect(url_for('index'))
 
     download_name = job.get("download_name", output_path.name)
-    return send_file(
+    return await send_file(
         output_path,
         as_attachment=True,
-        download_name=download_name,
-        mimetype=f"application/{output_path.suffix.lstrip('.')}"
+        attachment_filename=download_name,
+        mimetype=f"application/{output_path.suffix.lstrip('.')}",
+        # ETag and Last-Modified come from the file, retries can resume with Range
+        add_etags=True,
+        conditional=True,
     )
 
 
 @app.route('/about')
-def about():
+async def about():
     """About page with application information."""
-    return render_template('about.html')
+    return await render_template('about.html')
 
 
 @app.errorhandler(413)
-def too_large(e):
+async def too_large(e):
     """Handle file too large error."""
-    flash('File too large. Maximum size is 100MB.', 'error')
+    await flash('File too large. Maximum size is 100MB.', 'error')
     return redirect(url_for('index'))
 
 
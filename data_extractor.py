@@ -7,10 +7,56 @@ from typing import Dict, List, Optional, Tuple
 
 import pandas as pd
 
+from table_extractor import table_extractor
 from text_processor import text_processor
 
 logger = logging.getLogger(__name__)
 
+# Restriction type before the first colon. The explanation starts after the first
+# ": " and runs up to the last "<date> TARİH <file no>" reference, date and file
+# number come from the first reference anywhere in the text. Each part is matched
+# in a lookahead from the start, so one failing part leaves the others intact.
+_R_TARIH_FILENO = r"(?:\d{2}\/\d{2}\/\d{4}|BİLA) TARİH (?:\d+\/\d+|\d+-\d+|\d+|[A-Fa-f0-9]{32})"
+_R_ACIKLAMA = re.compile(
+    r"^(?=(?P<haciz_type>[^:(]+)\s*:)"
+    rf"(?=(?:.*?: (?P<aciklama_ext>.*{_R_TARIH_FILENO}))?)"
+    r"(?=(?:.*?(?P<aciklama_date>\d{2}\/\d{2}\/\d{4}|BİLA) TARİH "
+    r"(?P<aciklama_fileno>\d+\/\d+|\d+-\d+|\d+|[A-Fa-f0-9]{32}))?)"
+)
+
+# Registration date and journal number, e.g. "... 13-03-2020 - 4567"
+_R_TARIH_YEVMIYE = re.compile(r"(?P<tarih>\d{2}-\d{2}-\d{4}).*- (?P<yevmiye>\d+)")
+
+# Literal office name fixes, matched in one pass. Keys that combine two fixes
+# cover the cases where one fix used to produce the input of another.
+_ICRA_DAIRESI_LITERALS = {
+    'GEBZE 4 İCRA MÜDÜRLÜĞÜ MÜDÜRLÜĞÜ': 'GEBZE 4. İCRA DAİRESİ',
+    'GEBZE 4 İCRA DAİRESİ MÜDÜRLÜĞÜ': 'GEBZE 4. İCRA DAİRESİ',
+    'GEBZE 4 İCRA MÜDÜRLÜĞÜ': 'GEBZE 4. İCRA DAİRESİ',
+    'GEBZE 4 İCRA DAİRESİ': 'GEBZE 4. İCRA DAİRESİ',
+    'ANADOLU 1 TÜKETİCİ': 'ANADOLU 1. TÜKETİCİ',
+    'İCRA MÜDÜRLÜĞÜ MÜDÜRLÜĞÜ': 'İCRA DAİRESİ',
+    'İCRA DAİRESİ MÜDÜRLÜĞÜ': 'İCRA DAİRESİ',
+    'İCRA MÜDÜRLÜĞÜ': 'İCRA DAİRESİ',
+    'MEHKEMESİNE': 'MAHKEMESİ',
+    'MAHKEMESİNE': 'MAHKEMESİ',
+    'MEHKEMESİ': 'MAHKEMESİ',
+}
+# Longest keys first so a combined fix wins over its parts
+_R_ICRA_DAIRESI_LITERAL = re.compile(
+    "|".join(re.escape(key) for key in sorted(_ICRA_DAIRESI_LITERALS, key=len, reverse=True))
+)
+
+# Normalization rewrites for enforcement office names, applied in order
+_ICRA_DAIRESI_REWRITES = [
+    (re.compile(r'(?<=\d)\.(?!\s)'), '. '),
+    (re.compile(r'\.\.$'), ''),
+    (re.compile(r'\bT\.C\. ?'), ''),
+    (_R_ICRA_DAIRESI_LITERAL, lambda match: _ICRA_DAIRESI_LITERALS[match.group(0)]),
+    (re.compile(r'([A-ZÇĞİÖŞÜ])BELEDİYESİ'), r'\1 BELEDİYESİ'),
+    (re.compile(r'S.G.M.'), r'SOSYAL GÜVENLİK MERKEZİ'),
+]
+
 
 class DataExtractor:
     """Handles data extraction and processing from extracted tables."""
@@ -32,13 +78,13 @@ class DataExtractor:
         col_2 = dfs[1]
         
         try:
-            tasinmaz_kimlik_no = int(str(col_1.iloc[1, 1]))
-            il, ilce = text_processor.extract_il_ilce(str(col_1.iloc[2, 1]))
-            blok, kat, giris, bbno = text_processor.extract_blok_kat_giris_bbno(str(col_2.iloc[5, 1]))
-            kurum_adi = text_processor.clean(str(col_1.iloc[3, 1]))
-            mahalle = text_processor.capitalize(str(col_1.iloc[4, 1]))
-            ada, parsel = text_processor.extract_ada_parsel(str(col_2.iloc[0, 1]))
-            bagimsiz_bolum_nitelik = text_processor.capitalize(text_processor.clean(str(col_2.iloc[2, 1])))
+            tasinmaz_kimlik_no = int(col_1.iat[1, 1])
+            il, ilce = text_processor.extract_il_ilce(str(col_1.iat[2, 1]))
+            blok, kat, giris, bbno = text_processor.extract_blok_kat_giris_bbno(str(col_2.iat[5, 1]))
+            kurum_adi = text_processor.clean(str(col_1.iat[3, 1]))
+            mahalle = text_processor.capitalize(str(col_1.iat[4, 1]))
+            ada, parsel = text_processor.extract_ada_parsel(str(col_2.iat[0, 1]))
+            bagimsiz_bolum_nitelik = text_processor.capitalize(text_processor.clean(str(col_2.iat[2, 1])))
             
             info = {
                 "tasinmaz_kimlik_no": tasinmaz_kimlik_no,
@@ -57,26 +103,27 @@ class DataExtractor:
             
             return info
             
-        except Exception as e:
+        # Missing cells or an unparsable identity number mean an unexpected layout
+        except (IndexError, TypeError, ValueError) as e:
             logger.error(f"Failed to extract general info: {str(e)}")
             return {}
     
     def extract_mulkiyete_ait_serh_beyan(self, dfs: List[pd.DataFrame]) -> pd.DataFrame:
         """Extract property restriction declarations."""
-        from table_extractor import table_extractor
-        
         dfs_ = [df for df in dfs if len(df.columns) == 6]
         
         if not dfs_:
             return pd.DataFrame()
         
-        df = pd.concat(dfs_, ignore_index=True)
+        df = pd.concat(dfs_, ignore_index=True, copy=False)
         
+        # Positional slices instead of drop() so no index lookup is rebuilt;
+        # fix_continuation builds a fresh frame, so no reset is needed before it
         if pd.isna(df.iloc[0, 0]) or df.iloc[0, 0] == "":
-            df = df.drop(df.index[0]).reset_index(drop=True)
+            df = df.iloc[1:]
         
         df = table_extractor.fix_continuation(df)
-        df = df.drop(df.index[0]).reset_index(drop=True)
+        df = df.iloc[1:].reset_index(drop=True)
         
         df.columns = [
             "s/b/i",
@@ -91,58 +138,67 @@ class DataExtractor:
     
     def extract_aciklama(self, df: pd.DataFrame) -> pd.DataFrame:
         """Extract and parse explanation fields."""
-        r_tarih_fileno = r"(\d{2}\/\d{2}\/\d{4}|BİLA) TARİH (\d+\/\d+|\d+-\d+|\d+|[A-Fa-f0-9]{32})"
-        r_aciklama_relevant = r": (.*(\d{2}\/\d{2}\/\d{4}|BİLA) TARİH (\d+\/\d+|\d+-\d+|\d+|[A-Fa-f0-9]{32}))"
-        r_haciz_type = r'^([^:(]+)\s*:'
+        concat = df["aciklama"].str.extract(_R_ACIKLAMA)
         
-        haciz_type = df["aciklama"].str.extract(r_haciz_type)[0].fillna('').map(text_processor.clean).map(text_processor.capitalize)
+        # str.title() is not Turkish-locale aware, keep the ICU based helpers
+        haciz_type = concat["haciz_type"].fillna('')
+        haciz_type = pd.Series(
+            text_processor.clean_capitalize_batch(haciz_type.tolist()), index=haciz_type.index
+        )
         mask = haciz_type.notna()
         
-        if mask.any():
-            aciklama_relevant = df.loc[mask, "aciklama"].str.extract(r_aciklama_relevant)[0]
-            tarih_fileno = df.loc[mask, "aciklama"].str.extract(r_tarih_fileno)
-        else:
-            aciklama_relevant = pd.Series(None, index=df.index)
-            tarih_fileno = pd.DataFrame(None, index=df.index, columns=[0])
-        
-        concat = pd.concat([haciz_type, aciklama_relevant, tarih_fileno], axis=1)
-        concat.columns = ['haciz_type', 'aciklama_ext', 'aciklama_date', 'aciklama_fileno']
+        concat["haciz_type"] = haciz_type
+        details = ['aciklama_ext', 'aciklama_date', 'aciklama_fileno']
+        concat[details] = concat[details].where(mask)
         return concat
     
     def extract_date_yevmiye(self, df: pd.DataFrame) -> pd.DataFrame:
         """Extract date and journal number."""
-        r_tarih_yevmiye = r'(\d{2}-\d{2}-\d{4}).*- (\d+)'
-        concat = df['tesis_kurum/tarih/yevmiye'].str.extract(r_tarih_yevmiye)
-        concat.columns = ['tarih', 'yevmiye']
+        concat = df['tesis_kurum/tarih/yevmiye'].str.extract(_R_TARIH_YEVMIYE)
         concat["yevmiye"] = pd.to_numeric(concat["yevmiye"], errors="coerce")
-        concat["tarih"] = pd.to_datetime(concat["tarih"], format="%d-%m-%Y").dt.strftime("%d/%m/%Y")
+        # Kept as datetime64, the exporters format it as dd/mm/yyyy
+        concat["tarih"] = pd.to_datetime(concat["tarih"], format="%d-%m-%Y", cache=True, errors="coerce")
         return concat
     
-    def get_icra_dairesi(self, value):
-        """Extract enforcement office from text."""
-        if not pd.isna(value) and "NİN" in str(value):
-            return str(value).split("NİN")[0].strip()
-        return None
-    
     def extract_icra_dairesi(self, df: pd.DataFrame) -> pd.DataFrame:
         """Extract and clean enforcement office information."""
-        icra_dairesi = df["aciklama_ext"].map(self.get_icra_dairesi)
-        icra_dairesi = icra_dairesi.str.replace(r'(?<=\d)\.(?!\s)', '. ', regex=True)
-        icra_dairesi = icra_dairesi.str.replace(r'\.\.$', '', regex=True)
-        icra_dairesi = icra_dairesi.str.replace(r'\bT\.C\. ?', '', regex=True)
-        icra_dairesi = icra_dairesi.str.replace(r'İCRA MÜDÜRLÜĞÜ', 'İCRA DAİRESİ', regex=False)
-        icra_dairesi = icra_dairesi.str.replace(r'GEBZE 4 İCRA DAİRESİ', 'GEBZE 4. İCRA DAİRESİ', regex=False)
-        icra_dairesi = icra_dairesi.str.replace(r'ANADOLU 1 TÜKETİCİ', 'ANADOLU 1. TÜKETİCİ', regex=False)
-        icra_dairesi = icra_dairesi.str.replace(r'İCRA DAİRESİ MÜDÜRLÜĞÜ', 'İCRA DAİRESİ', regex=False)
-        icra_dairesi = icra_dairesi.str.replace(r'MEHKEMESİ', 'MAHKEMESİ', regex=False)
-        icra_dairesi = icra_dairesi.str.replace(r'MAHKEMESİNE', 'MAHKEMESİ', regex=False)
-        icra_dairesi = icra_dairesi.str.replace(r'([A-ZÇĞİÖŞÜ])BELEDİYESİ', r'\1 BELEDİYESİ', regex=True)
-        icra_dairesi = icra_dairesi.str.replace(r'S.G.M.', r'SOSYAL GÜVENLİK MERKEZİ', regex=True)
+        # The office name is everything before the first "NİN" suffix
+        aciklama_ext = df["aciklama_ext"]
+        has_office = aciklama_ext.str.contains("NİN", regex=False, na=False)
+        icra_dairesi = aciklama_ext.str.split("NİN", n=1).str[0].str.strip().where(has_office, None)
+        
+        for pattern, replacement in _ICRA_DAIRESI_REWRITES:
+            icra_dairesi = icra_dairesi.str.replace(pattern, replacement, regex=True)
         
-        icra_dairesi = icra_dairesi.map(text_processor.clean).map(text_processor.capitalize)
+        icra_dairesi = pd.Series(
+            text_processor.clean_capitalize_batch(icra_dairesi.tolist()), index=icra_dairesi.index
+        )
         icra_dairesi.name = "icra_dairesi"
         icra_dairesi.index = df.index
         return icra_dairesi.to_frame()
+    
+    def extract_all(self, df: pd.DataFrame) -> Dict[str, pd.Series]:
+        """
+        Extract every derived field of the restriction table.
+        
+        Each source column is scanned once: the explanation feeds the restriction
+        type, its details and the enforcement office, the registration column the
+        date and journal number.
+        
+        Args:
+            df: Cleaned restriction table
+            
+        Returns:
+            Derived columns by name, in output order, sharing the table's index
+        """
+        df_aciklama = self.extract_aciklama(df)
+        df_date_yevmiye = self.extract_date_yevmiye(df)
+        icra_dairesi = self.extract_icra_dairesi(df_aciklama)["icra_dairesi"]
+        return {
+            **{name: df_aciklama[name] for name in df_aciklama.columns},
+            **{name: df_date_yevmiye[name] for name in df_date_yevmiye.columns},
+            "icra_dairesi": icra_dairesi,
+        }
 
 
 # Global instance for convenience
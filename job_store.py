@@ -0,0 +1,219 @@
+"""
+Job state and progress event storage shared between server and worker processes.
+"""
+import logging
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import orjson
+
+logger = logging.getLogger(__name__)
+
+
+class JobStore:
+    """
+    SQLite backed job registry.
+
+    Every process (server workers and PDF worker processes alike) opens the same
+    database file, so job state and progress events are visible no matter which
+    process created the job or which one serves the progress stream.
+    """
+
+    FIELDS = {
+        "status",
+        "output_format",
+        "total",
+        "processed",
+        "output_path",
+        "error",
+        "download_name",
+        "files",
+    }
+
+    def __init__(self, db_path: Path):
+        """
+        Initialize the job store.
+
+        Args:
+            db_path: Path to the SQLite database file
+        """
+        self.db_path = db_path
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+
+        conn = self._connect()
+        conn.execute("PRAGMA journal_mode=WAL")
+        with conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id TEXT PRIMARY KEY,
+                    status TEXT NOT NULL,
+                    output_format TEXT,
+                    total INTEGER NOT NULL DEFAULT 0,
+                    processed INTEGER NOT NULL DEFAULT 0,
+                    output_path TEXT,
+                    error TEXT,
+                    download_name TEXT,
+                    files TEXT,
+                    updated_at REAL NOT NULL
+                )
+                """
+            )
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS events (
+                    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                    job_id TEXT NOT NULL,
+                    event TEXT NOT NULL,
+                    payload BLOB NOT NULL
+                )
+                """
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS events_job_seq ON events (job_id, seq)")
+
+    def _connect(self) -> sqlite3.Connection:
+        """Return the connection for the calling thread, opening it on first use."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def create(self, job_id: str, **fields: Any) -> None:
+        """Register a new job with its initial fields."""
+        fields = self._encode(fields)
+        columns = ["id", "updated_at", *fields]
+        values = [job_id, time.time(), *fields.values()]
+        placeholders = ", ".join("?" for _ in columns)
+        with self._connect() as conn:
+            conn.execute(
+                f"INSERT INTO jobs ({', '.join(columns)}) VALUES ({placeholders})",
+                values,
+            )
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Retrieve a job by ID."""
+        row = self._connect().execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+        job = dict(row)
+        if job["files"] is not None:
+            job["files"] = orjson.loads(job["files"])
+        return job
+
+    def update(self, job_id: str, **fields: Any) -> None:
+        """Update fields of an existing job."""
+        if not fields:
+            return
+        fields = self._encode(fields)
+        assignments = ", ".join(f"{name} = ?" for name in fields)
+        with self._connect() as conn:
+            conn.execute(
+                f"UPDATE jobs SET {assignments}, updated_at = ? WHERE id = ?",
+                [*fields.values(), time.time(), job_id],
+            )
+
+    def touch(self, job_id: str) -> None:
+        """Refresh a job's last update time, so it does not expire while in use."""
+        with self._connect() as conn:
+            conn.execute("UPDATE jobs SET updated_at = ? WHERE id = ?", (time.time(), job_id))
+
+    def publish(self, job_id: str, event: Dict[str, Any]) -> None:
+        """
+        Append a progress event to the job's event log.
+
+        Events of jobs that no longer exist are dropped, a worker may still report
+        progress for a job that was purged meanwhile.
+        """
+        with self._connect() as conn:
+            conn.execute(
+                """
+                INSERT INTO events (job_id, event, payload)
+                SELECT ?, ?, ? WHERE EXISTS (SELECT 1 FROM jobs WHERE id = ?)
+                """,
+                (job_id, event.get("event", "message"), orjson.dumps(event), job_id),
+            )
+
+    def events_since(self, job_id: str, seq: int = 0) -> List[Tuple[int, str, bytes]]:
+        """
+        Return the job's events published after the given sequence number.
+
+        Events come back as (seq, event name, JSON payload) so they can be
+        streamed without decoding them again.
+        """
+        rows = self._connect().execute(
+            "SELECT seq, event, payload FROM events WHERE job_id = ? AND seq > ? ORDER BY seq",
+            (job_id, seq),
+        ).fetchall()
+        return [(row["seq"], row["event"], row["payload"]) for row in rows]
+
+    def events_for_jobs(self, cursors: Dict[str, int]) -> List[Tuple[str, int, str, bytes]]:
+        """
+        Return the events of several jobs in one query.
+
+        Args:
+            cursors: Job ID to the sequence number of its last event already seen
+
+        Returns:
+            (job ID, seq, event name, JSON payload) of newer events, in seq order
+        """
+        if not cursors:
+            return []
+        values = ", ".join("(?, ?)" for _ in cursors)
+        rows = self._connect().execute(
+            f"""
+            WITH cursors (job_id, seq) AS (VALUES {values})
+            SELECT events.job_id, events.seq, events.event, events.payload
+            FROM cursors JOIN events ON events.job_id = cursors.job_id AND events.seq > cursors.seq
+            ORDER BY events.seq
+            """,
+            [value for cursor in cursors.items() for value in cursor],
+        ).fetchall()
+        return [(row["job_id"], row["seq"], row["event"], row["payload"]) for row in rows]
+
+    def purge_expired(self, finished_before: float, updated_before: float) -> List[Tuple[str, Optional[str]]]:
+        """
+        Delete expired jobs with their events.
+
+        Completed and failed jobs expire once last updated before finished_before.
+        Jobs in any other status expire once last updated before updated_before,
+        which catches jobs a restart or crash left queued or processing.
+
+        Args:
+            finished_before: Unix timestamp, older finished jobs are deleted
+            updated_before: Unix timestamp, older jobs are deleted whatever their status
+
+        Returns:
+            (job ID, output file path) of the deleted jobs, for the caller to clean up
+        """
+        with self._connect() as conn:
+            rows = conn.execute(
+                """
+                SELECT id, output_path FROM jobs
+                WHERE (status IN ('completed', 'error') AND updated_at < ?) OR updated_at < ?
+                """,
+                (finished_before, updated_before),
+            ).fetchall()
+            job_ids = [(row["id"],) for row in rows]
+            conn.executemany("DELETE FROM events WHERE job_id = ?", job_ids)
+            conn.executemany("DELETE FROM jobs WHERE id = ?", job_ids)
+        if rows:
+            logger.info(f"Purged {len(rows)} expired job(s)")
+        return [(row["id"], row["output_path"]) for row in rows]
+
+    def _encode(self, fields: Dict[str, Any]) -> Dict[str, Any]:
+        """Validate field names and serialize values SQLite cannot store directly."""
+        unknown = set(fields) - self.FIELDS
+        if unknown:
+            raise ValueError(f"Unknown job fields: {', '.join(sorted(unknown))}")
+        if "files" in fields and fields["files"] is not None:
+            fields = {**fields, "files": orjson.dumps(fields["files"])}
+        return fields
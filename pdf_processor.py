@@ -2,10 +2,18 @@
 Simplified PDF Processor for WebtapuApp
 Uses refactored modules for cleaner code organization.
 """
+import io
 import logging
+import multiprocessing
+import os
+import queue
+import tempfile
+import threading
 import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
-from typing import Dict, List, Optional, Any, Callable
+from typing import Dict, Iterator, List, Optional, Any, Callable, Tuple, Union
 
 import pandas as pd
 from tqdm.auto import tqdm
@@ -18,6 +26,54 @@ from data_extractor import data_extractor
 logger = logging.getLogger(__name__)
 
 
+class UploadedPdf(io.BytesIO):
+    """In-memory PDF upload that keeps its original filename."""
+    
+    def __init__(self, data: bytes, name: str):
+        super().__init__(data)
+        self.name = name
+    
+    def __str__(self) -> str:
+        return self.name
+
+
+# PDFs are either files on disk or small uploads kept in memory
+PdfSource = Union[Path, UploadedPdf]
+
+# Exported columns, in output order, with their spreadsheet headers
+_EXPORT_RENAME = {
+    "source_file": "Kaynak Dosyasi",
+    "s/b/i": "S/B/I",
+    "haciz_type": "Haciz Turu",
+    "aciklama": "Aciklama",
+    "aciklama_ext": "Aciklama Extracted",
+    "tarih": "Tarih",
+    "aciklama_fileno": "Dosya Numarasi",
+    "yevmiye": "Yevmiye",
+    "icra_dairesi": "Icra Dairesi",
+    "il": "Il",
+    "ilce": "Ilce",
+    "mahalle": "Mahalle",
+    "bagimsiz_bolum_nitelik": "Bagimsiz Bolum Nitelik",
+    "ada": "Ada",
+    "parsel": "Parsel",
+    "blok": "Blok",
+    "kat": "Kat",
+    "giris": "Giris",
+    "bbno": "BBNo",
+}
+_EXPORT_COLUMNS = tuple(_EXPORT_RENAME)
+_EXPORT_HEADERS = tuple(_EXPORT_RENAME.values())
+
+# Upper bound of per-file progress events reported for one batch
+MAX_PROGRESS_EVENTS = 100
+
+
+def _process_pdf_worker(pdf_path: PdfSource, clean_watermarks: bool, temp_dir: Path) -> Optional[pd.DataFrame]:
+    """Worker process entry point, processes one PDF with its own processor."""
+    return PDFProcessor(temp_dir).process_single_pdf(pdf_path, clean_watermarks)
+
+
 class PDFProcessor:
     """
     Main PDF processing class that coordinates between different modules.
@@ -35,29 +91,85 @@ class PDFProcessor:
         self.temp_dir = temp_dir or Path("/tmp/webtapu")
         self.temp_dir.mkdir(parents=True, exist_ok=True)
     
-    def process_single_pdf(self, pdf_path: Path, clean_watermarks: bool = True) -> Optional[pd.DataFrame]:
+    def materialize(self, pdf_path: PdfSource) -> Path:
+        """
+        Return a filesystem path for the PDF, spilling in-memory uploads to disk.
+        
+        Uploads are spilled to a file of their own, since jobs running at the same
+        time may carry uploads with the same name. See _discard_copy.
+        
+        Args:
+            pdf_path: PDF file path or in-memory upload
+            
+        Returns:
+            Path to a PDF file on disk
+        """
+        if isinstance(pdf_path, Path):
+            return pdf_path
+        
+        spill_dir = self.temp_dir / "uploads"
+        spill_dir.mkdir(parents=True, exist_ok=True)
+        fd, spill_path = tempfile.mkstemp(dir=spill_dir, suffix=".pdf")
+        with os.fdopen(fd, "wb") as dst:
+            dst.write(pdf_path.getvalue())
+        return Path(spill_path)
+    
+    def _discard_copy(self, pdf_path: PdfSource, cleaned_path: Optional[Path]) -> None:
+        """Delete a temporary copy of the PDF made by clean_pdf, the original is kept."""
+        if cleaned_path is not None and cleaned_path != pdf_path:
+            cleaned_path.unlink(missing_ok=True)
+    
+    def clean_pdf(self, pdf_path: PdfSource, clean_watermarks: bool = True) -> Path:
+        """
+        Prepare a PDF for table extraction, removing watermarks if requested.
+        
+        Args:
+            pdf_path: Path to PDF file or in-memory upload
+            clean_watermarks: Whether to remove watermarks
+            
+        Returns:
+            Path to the PDF file to extract tables from, a temporary copy unless
+            it is the original file on disk
+        """
+        if clean_watermarks:
+            # The cleaned copy is edited in place, every call needs a file of its own
+            cleaned_dir = self.temp_dir / "cleaned"
+            cleaned_dir.mkdir(parents=True, exist_ok=True)
+            fd, cleaned_name = tempfile.mkstemp(dir=cleaned_dir, suffix=".pdf")
+            os.close(fd)
+            cleaned_path = Path(cleaned_name)
+            if watermark_remover.remove_watermarks(pdf_path, cleaned_path):
+                return cleaned_path
+            cleaned_path.unlink(missing_ok=True)
+            logger.warning(f"Watermark removal failed, using original: {pdf_path}")
+        return self.materialize(pdf_path)
+    
+    def process_single_pdf(
+        self,
+        pdf_path: PdfSource,
+        clean_watermarks: bool = True,
+        cleaned_path: Optional[Path] = None,
+    ) -> Optional[pd.DataFrame]:
         """
         Process a single PDF file through the entire pipeline.
         
         Args:
-            pdf_path: Path to PDF file
+            pdf_path: Path to PDF file or in-memory upload
             clean_watermarks: Whether to remove watermarks first
+            cleaned_path: Result of clean_pdf when it already ran, skips that step
             
         Returns:
             DataFrame with extracted data or None if processing failed
         """
         try:
-            # Remove watermarks if requested
-            if clean_watermarks:
-                cleaned_path = self.temp_dir / "cleaned" / pdf_path.name
-                if not watermark_remover.remove_watermarks(pdf_path, cleaned_path):
-                    logger.warning(f"Watermark removal failed, using original: {pdf_path}")
-                    cleaned_path = pdf_path
-            else:
-                cleaned_path = pdf_path
+            if cleaned_path is None:
+                cleaned_path = self.clean_pdf(pdf_path, clean_watermarks)
             
-            # Extract tables
-            file_dfs = table_extractor.extract_tables(cleaned_path)
+            # Extract tables, the temporary copy they are read from is not needed after
+            try:
+                file_dfs = table_extractor.extract_tables(cleaned_path)
+            finally:
+                self._discard_copy(pdf_path, cleaned_path)
             if not file_dfs:
                 logger.error(f"No tables extracted from {pdf_path}")
                 return None
@@ -75,20 +187,27 @@ class PDFProcessor:
                 return None
             
             # Clean and process data
-            df_masb = df_masb.map(text_processor.clean)
-            df_masb = df_masb.map(text_processor.upper)
+            df_masb = df_masb.apply(text_processor.clean_series)
+            df_masb = df_masb.apply(text_processor.upper_series)
             
             # Extract additional fields
-            df_aciklama = data_extractor.extract_aciklama(df_masb)
-            df_date_yevmiye = data_extractor.extract_date_yevmiye(df_masb)
-            df_icra_dairesi = data_extractor.extract_icra_dairesi(df_aciklama)
+            df_fields = pd.DataFrame(data_extractor.extract_all(df_masb), copy=False)
             
             # Combine all data
-            df_final = pd.concat([df_masb, df_aciklama, df_date_yevmiye, df_icra_dairesi], axis=1)
-            df_final = df_final.assign(**general_info)
-            df_final = df_final.assign(
-                source_file=pdf_path.name,
-                # source_dir=str(pdf_path.parent),
+            # Per-file fields are broadcast into frames so the result is built in a single
+            # concat, with source_file already in front where the combined output wants it
+            df_source = pd.DataFrame(
+                {
+                    "source_file": pdf_path.name,
+                    # "source_dir": str(pdf_path.parent),
+                },
+                index=df_masb.index,
+            )
+            df_general = pd.DataFrame(general_info, index=df_masb.index)
+            df_final = pd.concat(
+                [df_source, df_masb, df_fields, df_general],
+                axis=1,
+                copy=False,
             )
             
             logger.info(f"Successfully processed {pdf_path}")
@@ -101,23 +220,33 @@ class PDFProcessor:
     
     def process_multiple_pdfs(
         self,
-        pdf_paths: List[Path],
+        pdf_paths: List[PdfSource],
         clean_watermarks: bool = True,
         progress_callback: Optional[Callable[[Dict[str, Any]], None]] = None,
+        max_workers: Optional[int] = None,
     ) -> pd.DataFrame:
         """
         Process multiple PDF files and combine results.
         
+        Files are independent, so batches are spread over a pool of worker
+        processes. Results keep the order of pdf_paths. Callers that already run
+        inside a worker process pass max_workers=1 so pools do not nest.
+        
         Args:
-            pdf_paths: List of PDF file paths
+            pdf_paths: List of PDF file paths or in-memory uploads
             clean_watermarks: Whether to remove watermarks first
+            max_workers: Worker processes to use, defaults to the CPU count
             
         Returns:
             Combined DataFrame with data from all successfully processed PDFs
         """
-        frames: List[pd.DataFrame] = []
+        results: List[Optional[pd.DataFrame]] = [None] * len(pdf_paths)
         failures = 0
         total = len(pdf_paths)
+        workers = min(max_workers or os.cpu_count() or 1, total)
+        # Report every progress_step-th file, the last one always goes out. The step
+        # is rounded up, so there are at most MAX_PROGRESS_EVENTS of them.
+        progress_step = max(1, -(-total // MAX_PROGRESS_EVENTS))
 
         if progress_callback:
             progress_callback({
@@ -126,16 +255,19 @@ class PDFProcessor:
                 "message": f"Processing {total} PDF file(s)"
             })
 
-        for index, pdf_path in enumerate(tqdm(pdf_paths, desc="Processing PDFs", unit="file"), start=1):
-            df = self.process_single_pdf(pdf_path, clean_watermarks)
+        completed = self._iter_processed(pdf_paths, clean_watermarks, workers)
+        for index, (position, df) in enumerate(
+            tqdm(completed, total=total, desc="Processing PDFs", unit="file"), start=1
+        ):
+            pdf_path = pdf_paths[position]
             if df is not None and not df.empty:
-                frames.append(df)
+                results[position] = df
                 status = "processed"
             else:
                 failures += 1
                 status = "failed"
 
-            if progress_callback:
+            if progress_callback and (index % progress_step == 0 or index == total):
                 percent = int((index / total) * 100) if total else 100
                 progress_callback({
                     "event": "progress",
@@ -144,9 +276,11 @@ class PDFProcessor:
                     "percent": percent,
                     "status": status,
                     "file": pdf_path.name,
+                    "failures": failures,
                     "message": f"Processing PDFs: {index}/{total} file(s) [{percent}%] ({status})"
                 })
 
+        frames = [df for df in results if df is not None]
         if not frames:
             logger.warning("No dataframes produced from any PDF")
             if progress_callback:
@@ -156,24 +290,150 @@ class PDFProcessor:
                 })
             return pd.DataFrame()
 
-        all_final = pd.concat(frames, ignore_index=True)
-        
-        # Reorder columns
-        cols = list(all_final.columns)
-        front = [c for c in ("source_file",) if c in cols]
-        rest = [c for c in cols if c not in front]
-        all_final = all_final[front + rest]
+        # Frames come with source_file in front, so the combined frame needs no
+        # reordering copy; drop the per-file frames as soon as they are combined
+        processed = len(frames)
+        all_final = pd.concat(frames, ignore_index=True, copy=False)
+        del frames, results
+        # Every row of a file repeats its name, store it once per file
+        all_final["source_file"] = all_final["source_file"].astype("category")
         
-        logger.info(f"Processed {len(frames)} PDFs successfully, {failures} failures")
+        logger.info(f"Processed {processed} PDFs successfully, {failures} failures")
         if progress_callback:
             progress_callback({
                 "event": "complete",
-                "processed": len(frames),
+                "processed": processed,
                 "failures": failures,
-                "message": f"Processed {len(frames)} PDF file(s) with {failures} failure(s)"
+                "message": f"Processed {processed} PDF file(s) with {failures} failure(s)"
             })
         return all_final
     
+    def _iter_processed(
+        self,
+        pdf_paths: List[PdfSource],
+        clean_watermarks: bool,
+        workers: int,
+    ) -> Iterator[Tuple[int, Optional[pd.DataFrame]]]:
+        """
+        Process PDFs and yield (position, DataFrame or None) as each one finishes.
+        
+        Args:
+            pdf_paths: List of PDF file paths or in-memory uploads
+            clean_watermarks: Whether to remove watermarks first
+            workers: Worker processes to use, with one the PDFs are processed in place.
+                That is how web jobs run, each on its own process_pool worker, so
+                watermark removal for upcoming files overlaps table extraction there.
+        """
+        if workers <= 1:
+            if clean_watermarks and len(pdf_paths) > 1:
+                yield from self._iter_pipelined(pdf_paths)
+                return
+            for position, pdf_path in enumerate(pdf_paths):
+                yield position, self.process_single_pdf(pdf_path, clean_watermarks)
+            return
+        
+        # A worker crash breaks the whole pool and fails every file still in it. The
+        # files left over are retried one at a time, where a crash points at its file.
+        pending = list(range(len(pdf_paths)))
+        while pending:
+            finished = set()
+            for position, df in self._iter_pooled(pdf_paths, pending, clean_watermarks, workers):
+                finished.add(position)
+                yield position, df
+            pending = [position for position in pending if position not in finished]
+            if not pending:
+                return
+            if workers == 1:
+                # The single worker takes files in order, the first one left crashed it
+                crashed, *pending = pending
+                logger.error(f"Failed to process {pdf_paths[crashed]}: worker process crashed")
+                yield crashed, None
+            else:
+                logger.warning(f"A worker process crashed, retrying {len(pending)} file(s) one at a time")
+            workers = 1
+    
+    def _iter_pooled(
+        self,
+        pdf_paths: List[PdfSource],
+        positions: List[int],
+        clean_watermarks: bool,
+        workers: int,
+    ) -> Iterator[Tuple[int, Optional[pd.DataFrame]]]:
+        """
+        Process the PDFs at the given positions on a fresh pool of worker processes.
+        
+        Files lost to a worker crash that broke the pool are not yielded, they are
+        left for the caller to retry.
+        
+        Args:
+            pdf_paths: List of PDF file paths or in-memory uploads
+            positions: Positions in pdf_paths of the PDFs to process
+            clean_watermarks: Whether to remove watermarks first
+            workers: Worker processes to use
+        """
+        # Spawned rather than forked, the caller may already run helper threads
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+        ) as executor:
+            futures = {
+                executor.submit(_process_pdf_worker, pdf_paths[position], clean_watermarks, self.temp_dir): position
+                for position in positions
+            }
+            try:
+                for future in as_completed(futures):
+                    position = futures[future]
+                    try:
+                        df = future.result()
+                    except BrokenProcessPool:
+                        continue
+                    except Exception as e:
+                        logger.error(f"Failed to process {pdf_paths[position]}: {str(e)}")
+                        df = None
+                    yield position, df
+            finally:
+                executor.shutdown(cancel_futures=True)
+    
+    def _iter_pipelined(self, pdf_paths: List[PdfSource]) -> Iterator[Tuple[int, Optional[pd.DataFrame]]]:
+        """
+        Process PDFs in place, removing watermarks of upcoming files in a background
+        thread while tables are extracted from the current one.
+        
+        Args:
+            pdf_paths: List of PDF file paths or in-memory uploads
+        """
+        cleaned: queue.Queue = queue.Queue(maxsize=4)
+        stop = threading.Event()
+        
+        def produce() -> None:
+            for position, pdf_path in enumerate(pdf_paths):
+                if stop.is_set():
+                    return
+                try:
+                    cleaned_path = self.clean_pdf(pdf_path)
+                except Exception as e:
+                    # Leave it to process_single_pdf, which retries and reports the failure
+                    logger.error(f"Failed to clean {pdf_path}: {str(e)}")
+                    cleaned_path = None
+                cleaned.put((position, cleaned_path))
+        
+        producer = threading.Thread(target=produce, name="watermark-remover", daemon=True)
+        producer.start()
+        try:
+            for _ in pdf_paths:
+                position, cleaned_path = cleaned.get()
+                yield position, self.process_single_pdf(pdf_paths[position], cleaned_path=cleaned_path)
+        finally:
+            # Unblock the producer if the consumer stopped early, and delete the
+            # cleaned copies nobody is going to read
+            stop.set()
+            while producer.is_alive() or not cleaned.empty():
+                try:
+                    position, cleaned_path = cleaned.get(timeout=0.1)
+                except queue.Empty:
+                    continue
+                self._discard_copy(pdf_paths[position], cleaned_path)
+    
     def generate_excel(self, df: pd.DataFrame, output_path: Path) -> bool:
         """
         Generate Excel file from processed data.
@@ -190,36 +450,18 @@ class PDFProcessor:
                 logger.warning("No data to export to Excel")
                 return False
             
-            # Select and rename columns for Excel output
-            df_clean = df[['source_file', 's/b/i', 'haciz_type', 'aciklama',
-                          'aciklama_ext', 'tarih', 'aciklama_fileno', 'yevmiye', 'icra_dairesi',
-                          'il', 'ilce', 'mahalle', 'bagimsiz_bolum_nitelik', 'ada', 'parsel',
-                          'blok', 'kat', 'giris', 'bbno']]
-            
-            df_clean.columns = [
-                "Kaynak Dosyasi",
-                "S/B/I",
-                "Haciz Turu",
-                "Aciklama",
-                "Aciklama Extracted",
-                "Tarih",
-                "Dosya Numarasi",
-                "Yevmiye",
-                "Icra Dairesi",
-                "Il",
-                "Ilce",
-                "Mahalle",
-                "Bagimsiz Bolum Nitelik",
-                "Ada",
-                "Parsel",
-                "Blok",
-                "Kat",
-                "Giris",
-                "BBNo",
-            ]
-            
             output_path.parent.mkdir(parents=True, exist_ok=True)
-            df_clean.to_excel(output_path, index=False)
+            with pd.ExcelWriter(
+                output_path,
+                engine="xlsxwriter",
+                date_format="dd/mm/yyyy",
+                datetime_format="dd/mm/yyyy",
+                # Cells are plain text, skip xlsxwriter's per-string URL detection.
+                # constant_memory is not an option: pandas writes column by column.
+                engine_kwargs={"options": {"strings_to_urls": False}},
+            ) as writer:
+                # The writer picks and relabels the columns, no renamed copy of the frame
+                df.to_excel(writer, index=False, columns=list(_EXPORT_COLUMNS), header=list(_EXPORT_HEADERS))
             logger.info(f"Excel file generated: {output_path}")
             return True
             
@@ -243,36 +485,16 @@ class PDFProcessor:
                 logger.warning("No data to export to CSV")
                 return False
             
-            # Use the same cleaned data as Excel
-            df_clean = df[['source_file', 's/b/i', 'haciz_type', 'aciklama',
-                          'aciklama_ext', 'tarih', 'aciklama_fileno', 'yevmiye', 'icra_dairesi',
-                          'il', 'ilce', 'mahalle', 'bagimsiz_bolum_nitelik', 'ada', 'parsel',
-                          'blok', 'kat', 'giris', 'bbno']]
-            
-            df_clean.columns = [
-                "Kaynak Dosyasi",
-                "S/B/I",
-                "Haciz Turu",
-                "Aciklama",
-                "Aciklama Extracted",
-                "Tarih",
-                "Dosya Numarasi",
-                "Yevmiye",
-                "Icra Dairesi",
-                "Il",
-                "Ilce",
-                "Mahalle",
-                "Bagimsiz Bolum Nitelik",
-                "Ada",
-                "Parsel",
-                "Blok",
-                "Kat",
-                "Giris",
-                "BBNo",
-            ]
-            
             output_path.parent.mkdir(parents=True, exist_ok=True)
-            df_clean.to_csv(output_path, index=False, encoding='utf-8-sig')
+            df.to_csv(
+                output_path,
+                columns=list(_EXPORT_COLUMNS),
+                header=list(_EXPORT_HEADERS),
+                index=False,
+                encoding='utf-8-sig',
+                date_format="%d/%m/%Y",
+                chunksize=50_000,
+            )
             logger.info(f"CSV file generated: {output_path}")
             return True
             
@@ -283,20 +505,22 @@ class PDFProcessor:
 
 # Convenience function for Flask integration
 def process_pdf_files(
-    pdf_files: List[Path],
+    pdf_files: List[PdfSource],
     output_format: str = "excel",
     output_path: Optional[Path] = None,
     clean_watermarks: bool = True,
     progress_callback: Optional[Callable[[Dict[str, Any]], None]] = None,
+    max_workers: Optional[int] = None,
 ) -> Dict[str, Any]:
     """
     Convenience function for Flask integration.
     
     Args:
-        pdf_files: List of PDF file paths
+        pdf_files: List of PDF file paths or in-memory uploads
         output_format: Output format ('excel', 'csv', 'text')
         output_path: Output file path (optional)
         clean_watermarks: Whether to remove watermarks
+        max_workers: Worker processes for the batch, see process_multiple_pdfs
         
     Returns:
         Dictionary with processing results
@@ -308,6 +532,7 @@ def process_pdf_files(
         pdf_files,
         clean_watermarks,
         progress_callback=progress_callback,
+        max_workers=max_workers,
     )
     
     if df.empty:
@@ -6,8 +6,11 @@ from pathlib import Path
 from typing import List, Optional
 
 import camelot
+import numpy as np
 import pandas as pd
 
+from text_processor import text_processor
+
 logger = logging.getLogger(__name__)
 
 
@@ -25,7 +28,7 @@ class TableExtractor:
             List of DataFrames containing extracted tables
         """
         try:
-            tables = camelot.read_pdf(str(pdf_path), flavor="lattice", pages="all", parallel=True)
+            tables = camelot.read_pdf(str(pdf_path), flavor="lattice", pages="all")
             dfs = [t.df for t in tables]
             logger.info(f"Extracted {len(dfs)} tables from {pdf_path.name}")
             return dfs
@@ -35,24 +38,26 @@ class TableExtractor:
     
     def fix_continuation(self, df: pd.DataFrame) -> pd.DataFrame:
         """Fix continuation lines in the DataFrame."""
-        from text_processor import text_processor
+        # Rows whose first cell is blank continue the closest row above that has one
+        is_head = text_processor.clean_series(df.iloc[:, 0]).notna().to_numpy()
+        if is_head.all():
+            return df.reset_index(drop=True)
+        if not is_head[0]:
+            raise IndexError("Table starts with a continuation row")
         
-        fixed_rows = []
+        positions = np.arange(len(is_head))
+        parents = np.maximum.accumulate(np.where(is_head, positions, 0))
         
-        for i, row in df.iterrows():
-            row_clean = text_processor.clean(row[0])
-            
-            if row_clean is None:
-                prev_row = fixed_rows[-1]
-                merged = [
-                    str(p) + " " + str(r) if str(r).strip() != "" else str(p)
-                    for p, r in zip(prev_row, row)
-                ]
-                fixed_rows[-1] = merged
-            else:
-                fixed_rows.append(list(row))
+        # Only continuation rows need Python work, merged in order into their head row
+        rows = df.to_numpy(dtype=object).tolist()
+        for position in np.flatnonzero(~is_head):
+            parent = parents[position]
+            rows[parent] = [
+                str(p) + " " + str(r) if str(r).strip() != "" else str(p)
+                for p, r in zip(rows[parent], rows[position])
+            ]
         
-        clean_df = pd.DataFrame(fixed_rows, columns=df.columns)
+        clean_df = pd.DataFrame([rows[position] for position in np.flatnonzero(is_head)], columns=df.columns)
         return clean_df
 
 
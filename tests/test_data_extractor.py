@@ -0,0 +1,94 @@
+"""
+Regression tests for the explanation and enforcement office extraction.
+
+The expected values are the output of the original step-by-step extraction, the
+single-pass regexes in data_extractor must keep producing them.
+"""
+import pandas as pd
+import pytest
+
+from data_extractor import data_extractor
+
+
+def _values(row: pd.Series) -> list:
+    """Row values with every missing marker turned into None."""
+    return [None if pd.isna(value) else value for value in row]
+
+
+@pytest.mark.parametrize(
+    ("aciklama", "expected"),
+    [
+        (
+            "HACİZ: ANKARA 4 İCRA MÜDÜRLÜĞÜNİN 01/02/2020 TARİH 2020/123",
+            ["Haciz", "ANKARA 4 İCRA MÜDÜRLÜĞÜNİN 01/02/2020 TARİH 2020/123", "01/02/2020", "2020/123"],
+        ),
+        # The explanation needs ": ", date and file number do not
+        (
+            "HACİZ:ANKARA 4 İCRA MÜDÜRLÜĞÜNİN 01/02/2020 TARİH 2020/123",
+            ["Haciz", None, "01/02/2020", "2020/123"],
+        ),
+        (
+            "HACİZ:X: ANKARA 4 İCRA MÜDÜRLÜĞÜNİN 01/02/2020 TARİH 2020/123",
+            ["Haciz", "ANKARA 4 İCRA MÜDÜRLÜĞÜNİN 01/02/2020 TARİH 2020/123", "01/02/2020", "2020/123"],
+        ),
+        # Date and file number come from the first reference, even before the colon
+        (
+            "HACİZ 01/01/2019 TARİH 9 : A 01/02/2020 TARİH 12",
+            ["Haciz 01/01/2019 Tarih 9", "A 01/02/2020 TARİH 12", "01/01/2019", "9"],
+        ),
+        # The explanation runs up to the last reference
+        (
+            "HACİZ: A 01/02/2020 TARİH 12 VE B 03/04/2021 TARİH 2021/5 SAYILI",
+            ["Haciz", "A 01/02/2020 TARİH 12 VE B 03/04/2021 TARİH 2021/5", "01/02/2020", "12"],
+        ),
+        (
+            "İPOTEK: BİLA TARİH 0123456789abcdef0123456789ABCDEF",
+            ["İpotek", "BİLA TARİH 0123456789", "BİLA", "0123456789"],
+        ),
+        # No restriction type, no details
+        (
+            "(X) HACİZ: ANKARA 4 İCRA MÜDÜRLÜĞÜNİN 01/02/2020 TARİH 2020/123",
+            [None, None, None, None],
+        ),
+    ],
+)
+def test_extract_aciklama(aciklama, expected):
+    df = data_extractor.extract_aciklama(pd.DataFrame({"aciklama": [aciklama]}))
+    columns = ["haciz_type", "aciklama_ext", "aciklama_date", "aciklama_fileno"]
+    assert _values(df.loc[0, columns]) == expected
+
+
+def test_no_icra_dairesi_without_space_after_colon():
+    df = data_extractor.extract_aciklama(pd.DataFrame({
+        "aciklama": [
+            "HACİZ: ANKARA 4 İCRA MÜDÜRLÜĞÜNİN 01/02/2020 TARİH 2020/123",
+            "HACİZ:ANKARA 4 İCRA MÜDÜRLÜĞÜNİN 01/02/2020 TARİH 2020/123",
+        ],
+    }))
+    icra_dairesi = data_extractor.extract_icra_dairesi(df)["icra_dairesi"]
+    assert _values(icra_dairesi) == ["Ankara 4 İcra Dairesi", None]
+
+
+@pytest.mark.parametrize(
+    ("aciklama_ext", "expected"),
+    [
+        # Fixes that used to feed into each other, now covered by combined keys
+        ("GEBZE 4 İCRA MÜDÜRLÜĞÜ MÜDÜRLÜĞÜNİN 01/02/2020 TARİH 2020/1", "Gebze 4. İcra Dairesi"),
+        ("GEBZE 4 İCRA DAİRESİ MÜDÜRLÜĞÜNİN 01/02/2020 TARİH 2020/1", "Gebze 4. İcra Dairesi"),
+        ("GEBZE 4 İCRA MÜDÜRLÜĞÜNİN 01/02/2020 TARİH 2020/1", "Gebze 4. İcra Dairesi"),
+        ("ANKARA 4 İCRA MÜDÜRLÜĞÜ MÜDÜRLÜĞÜNİN 01/02/2020 TARİH 2020/1", "Ankara 4 İcra Dairesi"),
+        ("ANKARA 4 İCRA DAİRESİ MÜDÜRLÜĞÜNİN 01/02/2020 TARİH 2020/1", "Ankara 4 İcra Dairesi"),
+        ("ANADOLU 1 TÜKETİCİ MEHKEMESİNENİN 01/02/2020 TARİH 2020/1", "Anadolu 1. Tüketici Mahkemesi"),
+        ("ANKARA 2 ASLİYE HUKUK MAHKEMESİNENİN 01/02/2020 TARİH 2020/1", "Ankara 2 Asliye Hukuk Mahkemesi"),
+        ("İSTANBUL 3.ASLİYE HUKUK MEHKEMESİNİN 01/02/2020 TARİH 2020/1", "İstanbul 3. Asliye Hukuk Mahkemesi"),
+        # Rewrites around the literal fixes
+        ("T.C. ANKARA 12.İCRA MÜDÜRLÜĞÜNİN 01/02/2020 TARİH 5", "Ankara 12. İcra Dairesi"),
+        ("KOCAELİBELEDİYESİNİN 01/02/2020 TARİH 5", "Kocaeli Belediyesi"),
+        ("ÇANKAYA S.G.M.NİN 01/02/2020 TARİH 5", "Çankaya Sosyal Güvenlik Merkezi"),
+        ("BU SATIRDA DAİRE YOK 01/02/2020 TARİH 5", None),
+        (None, None),
+    ],
+)
+def test_extract_icra_dairesi(aciklama_ext, expected):
+    df = data_extractor.extract_icra_dairesi(pd.DataFrame({"aciklama_ext": [aciklama_ext]}))
+    assert _values(df["icra_dairesi"]) == [expected]
@@ -1,60 +1,142 @@
 """
 Text processing utilities for Turkish text normalization and cleaning.
 """
+import functools
 import re
-from typing import Optional
+from typing import List, Optional
 
+import pandas as pd
 from icu import UnicodeString, Locale
 
+# Runs of whitespace, collapsed to a single space when cleaning
+_R_WHITESPACE = re.compile(r"\s+")
+
+_TR_LOCALE = Locale("TR")
+# Distinct strings converted through ICU, cell values repeat heavily across rows
+_ICU_CACHE_SIZE = 65536
+
+
+@functools.lru_cache(maxsize=_ICU_CACHE_SIZE)
+def _upper_str(text: str) -> str:
+    """Uppercase text with the Turkish locale."""
+    return str(UnicodeString(text).toUpper(_TR_LOCALE))
+
+
+@functools.lru_cache(maxsize=_ICU_CACHE_SIZE)
+def _lower_str(text: str) -> str:
+    """Lowercase text with the Turkish locale."""
+    return str(UnicodeString(text).toLower(_TR_LOCALE))
+
+
+@functools.lru_cache(maxsize=_ICU_CACHE_SIZE)
+def _title_str(text: str) -> str:
+    """Title-case text with the Turkish locale."""
+    return str(UnicodeString(text).toTitle(_TR_LOCALE))
+
 
 class TextProcessor:
     """Handles Turkish text normalization, cleaning, and formatting."""
     
     def __init__(self):
         """Initialize with Turkish locale."""
-        self.tr_locale = Locale("TR")
+        self.tr_locale = _TR_LOCALE
     
     def clean(self, value: Optional[str]) -> Optional[str]:
         """Clean and normalize text by removing newlines and extra spaces."""
         if value is None:
             return None
         
-        value = str(value).replace("\n", "")
-        parts = value.split()
-        
-        if len(parts) > 0:
-            value = " ".join(value.split()).strip()
-        else:
-            value = None
-        
-        return value
+        # Newlines are dropped outright, other whitespace runs become one space
+        value = _R_WHITESPACE.sub(" ", str(value).replace("\n", "")).strip()
+        return value or None
     
     def upper(self, text: Optional[str]) -> Optional[str]:
         """Convert text to uppercase using Turkish locale."""
         if text is None:
             return None
         
-        s = UnicodeString(str(text))
-        text = str(s.toUpper(self.tr_locale))
-        return text
+        text = str(text)
+        # Turkish only differs from plain ASCII casing for i (-> İ)
+        if text.isascii() and "i" not in text:
+            return text.upper()
+        return _upper_str(text)
     
     def lower(self, text: Optional[str]) -> Optional[str]:
         """Convert text to lowercase using Turkish locale."""
         if text is None:
             return None
         
-        s = UnicodeString(str(text))
-        text = str(s.toLower(self.tr_locale))
-        return text
+        text = str(text)
+        # Turkish only differs from plain ASCII casing for I (-> ı)
+        if text.isascii() and "I" not in text:
+            return text.lower()
+        return _lower_str(text)
     
     def capitalize(self, text: Optional[str]) -> Optional[str]:
         """Capitalize text using Turkish locale."""
         if text is None:
             return None
         
-        s = UnicodeString(str(text))
-        text = str(s.toTitle(self.tr_locale))
-        return text
+        return _title_str(str(text))
+    
+    def clean_series(self, values: pd.Series) -> pd.Series:
+        """
+        Vectorized clean: drop newlines, collapse whitespace, blank cells become None.
+        
+        Args:
+            values: Series of text cells
+            
+        Returns:
+            Cleaned Series with the same index
+        """
+        cleaned = (
+            values.str.replace("\n", "", regex=False)
+            .str.replace(_R_WHITESPACE, " ", regex=True)
+            .str.strip()
+        )
+        return cleaned.where(cleaned.str.len() > 0, None)
+    
+    def upper_series(self, values: pd.Series) -> pd.Series:
+        """
+        Uppercase a Series using Turkish locale, converting each distinct value once.
+        
+        Args:
+            values: Series of text cells
+            
+        Returns:
+            Uppercased Series with the same index, missing cells stay None
+        """
+        mapping = {value: self.upper(value) for value in values.dropna().unique()}
+        # Stay object dtype even when every cell is missing and nothing maps
+        return values.map(mapping).astype(object).where(values.notna(), None)
+    
+    def clean_capitalize_batch(self, values: List[Optional[str]]) -> List[Optional[str]]:
+        """
+        Clean and capitalize a batch of values in a single pass.
+
+        Equivalent to mapping clean and then capitalize over the values, but
+        walks the list once and converts each distinct value only once.
+
+        Args:
+            values: Values to normalize
+
+        Returns:
+            Normalized values in the same order
+        """
+        clean = self.clean
+        capitalize = self.capitalize
+        converted = {}
+        result = []
+        for value in values:
+            try:
+                result.append(converted[value])
+            except KeyError:
+                text = capitalize(clean(value))
+                converted[value] = text
+                result.append(text)
+            except TypeError:
+                result.append(capitalize(clean(value)))
+        return result
     
     def extract_ada_parsel(self, value: str) -> tuple[Optional[str], Optional[str]]:
         """Extract ada and parsel from value."""
@@ -2,8 +2,10 @@
 Watermark removal functionality for PDF files.
 """
 import re
+import shutil
+from io import BytesIO
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Union
 
 import fitz
 
@@ -22,54 +24,76 @@ class WatermarkRemover:
         self.target_size = target_size
         self.tolerance = tolerance
         
-        # Regular expressions for watermark removal
+        # Regular expressions for watermark removal. Tj strings and TJ arrays are
+        # matched in one pass, the group that matched picks the replacement.
         self.re_tf = re.compile(rb"/[^\s]+?\s+([+-]?\d+(?:\.\d+)?)\s+Tf")
-        self.re_tj = re.compile(rb"\((?:\\.|[^\)])*\)\s*Tj")
-        self.re_TJ = re.compile(rb"\[.*?\]\s*TJ", re.S)
+        self.re_text = re.compile(rb"(\((?:\\.|[^\)])*\)\s*Tj)|(\[.*?\]\s*TJ)", re.S)
+    
+    def _blank_text(self, m: re.Match) -> bytes:
+        """Replacement for a text showing operator inside a watermark region."""
+        return b"() Tj" if m.group(1) is not None else b"[] TJ"
     
     def scrub_stream(self, buf: bytes) -> bytes:
         """Remove watermark text from PDF stream."""
-        out = bytearray()
-        pos = 0
-        current_size = None
+        # Substring checks run in C far faster than the regex engine, streams
+        # without any font selection (images, vector art) skip the scan
+        if b"Tf" not in buf:
+            return buf
         
-        for m in self.re_tf.finditer(buf):
-            out += buf[pos : m.start()]
-            out += buf[m.start() : m.end()]
-            
+        matches = list(self.re_tf.finditer(buf))
+        if not matches:
+            return buf
+        
+        # Each Tf starts a region that runs until the next Tf (or the end). Only
+        # rewritten regions are sliced out, untouched bytes are copied once by
+        # the final join, and a stream without watermark text is returned as is.
+        parts = []
+        append = parts.append
+        pos = 0
+        for index, m in enumerate(matches):
             try:
                 current_size = float(m.group(1))
             except Exception:
-                current_size = None
-            
-            pos = m.end()
-            # region until next Tf (or end)
-            nxt = self.re_tf.search(buf, pos)
-            chunk_end = nxt.start() if nxt else len(buf)
-            chunk = buf[pos:chunk_end]
+                continue
+            if abs(current_size - self.target_size) > self.tolerance:
+                continue
             
-            if current_size is not None and abs(current_size - self.target_size) <= self.tolerance:
-                chunk = self.re_tj.sub(b"() Tj", chunk)
-                chunk = self.re_TJ.sub(b"[] TJ", chunk)
+            chunk_end = matches[index + 1].start() if index + 1 < len(matches) else len(buf)
+            chunk = buf[m.end() : chunk_end]
+            if b"Tj" not in chunk and b"TJ" not in chunk:
+                continue
             
-            out += chunk
+            append(buf[pos : m.end()])
+            append(self.re_text.sub(self._blank_text, chunk))
             pos = chunk_end
         
-        if pos < len(buf):
-            tail = buf[pos:]
-            if current_size is not None and abs(current_size - self.target_size) <= self.tolerance:
-                tail = self.re_tj.sub(b"() Tj", tail)
-                tail = self.re_TJ.sub(b"[] TJ", tail)
-            out += tail
+        if not parts:
+            return buf
+        append(buf[pos:])
+        return b"".join(parts)
+    
+    def _save_changes(self, doc: fitz.Document, output_path: Path) -> None:
+        """
+        Append the rewritten streams to the document's file.
+        
+        An incremental save leaves untouched objects as they are instead of
+        re-serializing and re-deflating the whole file. Documents MuPDF had to
+        repair cannot be saved incrementally and are rewritten in full.
+        """
+        if doc.can_save_incrementally():
+            doc.saveIncr()
+            return
         
-        return bytes(out)
+        full_path = output_path.with_name(output_path.name + ".tmp")
+        doc.save(full_path, deflate=True)
+        full_path.replace(output_path)
     
-    def remove_watermarks(self, pdf_path: Path, output_path: Path) -> bool:
+    def remove_watermarks(self, pdf_path: Union[Path, BytesIO], output_path: Path) -> bool:
         """
         Remove watermarks from PDF.
         
         Args:
-            pdf_path: Path to input PDF file
+            pdf_path: Path to input PDF file or in-memory PDF
             output_path: Path to save cleaned PDF
             
         Returns:
@@ -78,19 +102,32 @@ class WatermarkRemover:
         try:
             output_path.parent.mkdir(parents=True, exist_ok=True)
             
-            with fitz.open(pdf_path) as doc:
+            # Work on a copy of the original, so only rewritten streams need saving
+            if isinstance(pdf_path, BytesIO):
+                output_path.write_bytes(pdf_path.getvalue())
+            else:
+                shutil.copyfile(pdf_path, output_path)
+            
+            with fitz.open(output_path) as doc:
+                # Pages may share content streams, scrub every stream only once
+                xrefs = {}
                 for page in doc:
                     cx = page.get_contents()
-                    cxrefs = [cx] if isinstance(cx, int) else (cx or [])
-                    for xref in cxrefs:
-                        buf = doc.xref_stream(xref)
-                        if not buf:
-                            continue
-                        new_buf = self.scrub_stream(buf)
-                        if new_buf != buf:
-                            doc.update_stream(xref, new_buf)
+                    xrefs.update(dict.fromkeys([cx] if isinstance(cx, int) else (cx or [])))
+                
+                changed = False
+                for xref in xrefs:
+                    buf = doc.xref_stream(xref)
+                    if not buf:
+                        continue
+                    new_buf = self.scrub_stream(buf)
+                    if new_buf != buf:
+                        doc.update_stream(xref, new_buf)
+                        changed = True
                 
-                doc.save(output_path, deflate=True)
+                # No watermark text found, the copy already is the cleaned file
+                if changed:
+                    self._save_changes(doc, output_path)
             
             return True
             